@@ -1,14 +1,292 @@
+import concurrent.futures
+import contextlib
+import fcntl
+import functools
+import gzip
+import hashlib
+import io
 import logging
 import os
+import shutil
+import subprocess
 import tarfile
+from typing import IO, Any, Iterator, Optional, Set, Union
 
 import requests
-import tensorflow as tf
+from requests.adapters import HTTPAdapter
 
 MNIST_TF_RECORDS_FILE = "mnist-tfrecord.tar.gz"
 MNIST_TF_RECORDS_URL = (
     "https://s3-us-west-2.amazonaws.com/determined-ai-test-data/" + MNIST_TF_RECORDS_FILE
 )
+# Written next to the extracted data once extraction succeeds, containing the archive's SHA-256.
+MNIST_EXTRACTED_SENTINEL = ".mnist.ok"
+# Held while downloading or extracting, since every worker of a trial uses the same directory.
+MNIST_LOCK_FILE = ".mnist.lock"
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+# Number of threads writing extracted files to disk when falling back to the tarfile module.
+EXTRACT_WRITE_WORKERS = 16
+# Most files read from the archive but not yet written; bounds the memory held by pending writes.
+EXTRACT_MAX_PENDING = EXTRACT_WRITE_WORKERS * 2
+# GzipFile decompresses in 8 KiB steps; buffer in front of it so each decompress call does more.
+DECOMPRESS_BUFFER_SIZE = 4 << 20
+
+# Share one connection pool across every download in this process, rather than paying for a new
+# TCP+TLS handshake on each call.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
+
+def write_file(dest: str, data: bytes, mode: int, mtime: float) -> None:
+    with open(dest, "wb") as f:
+        f.write(data)
+    os.chmod(dest, mode)
+    os.utime(dest, (mtime, mtime))
+
+
+@functools.lru_cache(maxsize=None)
+def tar_bin() -> Optional[str]:
+    """
+    Return the path of a native tar binary which is safe to extract untrusted archives with, or
+    None if there is none.
+
+    A native tar extracts much faster than the tarfile module, which has a lot of per-member Python
+    overhead, but only GNU tar and bsdtar (libarchive) are trusted; other implementations, such as
+    busybox tar, do not protect against path traversal.
+    """
+    tar = shutil.which("tar")
+    if tar is None:
+        return None
+    try:
+        version = subprocess.run(
+            [tar, "--version"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    if b"GNU tar" in version or b"bsdtar" in version:
+        return tar
+    return None
+
+
+def extract_with_tar_bin(src: IO[bytes], path: str) -> None:
+    """
+    Extract the .tar.gz stream src into path with the tar binary returned by tar_bin().
+
+    This relies on the defaults of GNU tar and bsdtar, which apply whenever -P is not given: a
+    leading "/" is stripped from member names, and members with ".." in their name are refused.
+    Unlike safe_extract(), symlinks and hardlinks are extracted too, but neither tar writes through
+    them: bsdtar refuses to extract through a symlink, and GNU tar creates symlinks which could
+    point outside of path only after everything else has been extracted.
+    """
+    tar = tar_bin()
+    assert tar is not None
+    cmd = [tar, "--no-same-owner", "-xzf", "-", "-C", path]
+    # Unbuffered, so that closing stdin cannot fail on a flush if tar has already exited.
+    with subprocess.Popen(cmd, stdin=subprocess.PIPE, bufsize=0) as proc:
+        assert proc.stdin is not None
+        try:
+            shutil.copyfileobj(src, proc.stdin, DOWNLOAD_CHUNK_SIZE)
+        except BrokenPipeError:
+            # tar exited early; its exit status says why.
+            pass
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+
+def safe_extract(tar: tarfile.TarFile, path: "Union[str, os.PathLike[str]]" = ".") -> None:
+    """
+    Extract the directories and regular files in tar into path, refusing any member which would
+    land outside of path.
+
+    Each member is checked and extracted as it is read, in a single pass over the archive, rather
+    than checking getmembers() and then calling extractall(), which would read the archive twice
+    and cannot work at all on a non-seekable "r|" stream.
+    """
+    created_dirs: Set[str] = set()
+
+    def makedirs(directory: str) -> None:
+        if directory not in created_dirs:
+            os.makedirs(directory, exist_ok=True)
+            created_dirs.add(directory)
+
+    # tarfile can only parse the stream from one thread, but the open/write/close of each file is
+    # handed off to a thread pool so that files are written concurrently.
+    pending: Set[concurrent.futures.Future] = set()
+    # Resolve symlinks in the destination once.  Member paths are then only normalized, which is
+    # pure string manipulation; the archive cannot plant symlinks of its own, since only
+    # directories and regular files are extracted.
+    abs_path = os.path.realpath(os.fspath(path))
+    abs_prefix = os.path.join(abs_path, "")
+    with concurrent.futures.ThreadPoolExecutor(max_workers=EXTRACT_WRITE_WORKERS) as pool:
+        for member in tar:
+            # abs_prefix already ends in a separator, so plain concatenation does the work of
+            # os.path.join().  Unlike os.path.join(), an absolute member name is kept under
+            # abs_prefix, instead of replacing it.
+            member_path = os.path.normpath(abs_prefix + member.name)
+            if member_path != abs_path and not member_path.startswith(abs_prefix):
+                raise Exception("Attempted Path Traversal in Tar File")
+            if member.isdir():
+                makedirs(member_path)
+            elif member.isfile():
+                makedirs(os.path.dirname(member_path))
+                f = tar.extractfile(member)
+                assert f is not None
+                if len(pending) >= EXTRACT_MAX_PENDING:
+                    # Don't read ahead of the writers by more than a few files.
+                    done, pending = concurrent.futures.wait(
+                        pending, return_when=concurrent.futures.FIRST_COMPLETED
+                    )
+                    for future in done:
+                        future.result()
+                pending.add(
+                    pool.submit(write_file, member_path, f.read(), member.mode, member.mtime)
+                )
+    for future in pending:
+        future.result()
+
+
+def extract_with_tarfile(src: IO[bytes], path: str) -> None:
+    """
+    Extract the .tar.gz stream src into path with the tarfile module.
+
+    Decompression is done by GzipFile rather than by tarfile's "r:gz" mode, which double-buffers
+    the compressed and uncompressed data and slices bytes on every read.  A large BufferedReader on
+    top means tarfile's small record reads rarely reach the decompressor.
+    """
+    with gzip.GzipFile(fileobj=src, mode="rb") as gz:
+        buf = io.BufferedReader(gz, buffer_size=DECOMPRESS_BUFFER_SIZE)  # type: ignore
+        with tarfile.open(fileobj=buf, mode="r|") as tar:  # type: ignore
+            safe_extract(tar, path)
+
+
+def extract(src: IO[bytes], path: str) -> None:
+    if tar_bin() is not None:
+        extract_with_tar_bin(src, path)
+    else:
+        extract_with_tarfile(src, path)
+
+
+class _TeeReader:
+    """
+    A file-like wrapper around src which copies every byte read from it to dst.
+    """
+
+    def __init__(self, src: Any, dst: IO[bytes]) -> None:
+        self.src = src
+        self.dst = dst
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.src.read(size)
+        self.dst.write(data)
+        return bytes(data)
+
+    def drain(self) -> None:
+        # The extractor may stop reading at the end-of-archive marker, before the end of src.
+        while self.read(DOWNLOAD_CHUNK_SIZE):
+            pass
+
+
+@contextlib.contextmanager
+def exclusive_lock(lock_path: str) -> Iterator[None]:
+    with open(lock_path, "w") as f:
+        # The lock is released when f is closed.
+        fcntl.flock(f, fcntl.LOCK_EX)
+        yield
+
+
+def save_etag(part_path: str, r: requests.Response) -> None:
+    """
+    Record the ETag of the object being downloaded to part_path, so that a later resume can send it
+    as If-Range and only continue the download if the object is still the same version.  Weak
+    ETags are not allowed in If-Range, so they are not recorded.
+    """
+    etag = r.headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        with open(part_path + ".etag", "w") as f:
+            f.write(etag)
+    else:
+        remove_if_exists(part_path + ".etag")
+
+
+def download_and_extract(url: str, filepath: str, path: str) -> None:
+    """
+    Download the .tar.gz file at url to filepath, extracting it into path as it arrives, rather than
+    waiting for the download to finish first.  Like download_file(), the download is written to
+    filepath + ".part" until it is complete.
+    """
+    part_path = filepath + ".part"
+    with _SESSION.get(url, stream=True, timeout=30) as r:
+        r.raise_for_status()
+        # Read the archive exactly as it is stored, so that the saved copy is the .tar.gz itself.
+        r.raw.decode_content = False
+        save_etag(part_path, r)
+        with open(part_path, "wb") as f:
+            tee = _TeeReader(r.raw, f)
+            extract(tee, path)  # type: ignore
+            tee.drain()
+
+    os.replace(part_path, filepath)
+    remove_if_exists(part_path + ".etag")
+
+
+def download_file(url: str, filepath: str) -> None:
+    """
+    Download url to filepath.  The download is written to filepath + ".part" first, and a partial
+    download left behind by an earlier, interrupted call is resumed rather than restarted, as long
+    as the object has not changed since (see save_etag()).
+    """
+    part_path = filepath + ".part"
+    etag_path = part_path + ".etag"
+    offset = 0
+    headers = None
+    # A partial download without a recorded ETag cannot be checked against the remote object, so
+    # it is downloaded again from the start.
+    if os.path.exists(part_path) and os.path.exists(etag_path):
+        offset = os.path.getsize(part_path)
+        with open(etag_path) as f:
+            # If the object has changed, If-Range makes the server send all of it with a 200.
+            headers = {"Range": "bytes={}-".format(offset), "If-Range": f.read()}
+
+    with _SESSION.get(url, headers=headers, stream=True, timeout=30) as r:
+        content_range = r.headers.get("Content-Range", "")
+        if r.status_code == 416 or (
+            r.status_code == 206 and not content_range.startswith("bytes {}-".format(offset))
+        ):
+            # The partial download does not fit the remote file, or the server did not send the
+            # part that follows it; start over.
+            remove_if_exists(part_path)
+            remove_if_exists(etag_path)
+            download_file(url, filepath)
+            return
+        r.raise_for_status()
+        # A server which ignores the Range header sends the whole file with a 200 instead.
+        mode = "ab" if r.status_code == 206 else "wb"
+        if mode == "wb":
+            save_etag(part_path, r)
+        with open(part_path, mode) as f:
+            for chunk in r.iter_content(DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+
+    os.replace(part_path, filepath)
+    remove_if_exists(etag_path)
+
+
+def remove_if_exists(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def sha256_file(filepath: str) -> str:
+    with open(filepath, "rb") as f:
+        if hasattr(hashlib, "file_digest"):
+            # Python 3.11+ hashes the file without copying every chunk through Python.
+            return hashlib.file_digest(f, "sha256").hexdigest()  # type: ignore
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+            digest.update(chunk)
+        return digest.hexdigest()
 
 
 def download_data(download_directory: str) -> str:
@@ -17,41 +295,61 @@ def download_data(download_directory: str) -> str:
     The dataset will be downloaded into download_directory, if it is not already
     present.
     """
-    if not tf.io.gfile.exists(download_directory):
-        tf.io.gfile.makedirs(download_directory)
+    os.makedirs(download_directory, exist_ok=True)
 
     filepath = os.path.join(download_directory, MNIST_TF_RECORDS_FILE)
-    if not tf.io.gfile.exists(filepath):
-        logging.info("Downloading {}".format(MNIST_TF_RECORDS_URL))
-
-        r = requests.get(MNIST_TF_RECORDS_URL)
-        with tf.io.gfile.GFile(filepath, "wb") as f:
-            f.write(r.content)
-            logging.info("Downloaded {} ({} bytes)".format(MNIST_TF_RECORDS_FILE, f.size()))
-
-        logging.info("Extracting {} to {}".format(MNIST_TF_RECORDS_FILE, download_directory))
-        with tarfile.open(filepath, mode="r:gz") as f:
-            def is_within_directory(directory, target):
-                
-                abs_directory = os.path.abspath(directory)
-                abs_target = os.path.abspath(target)
-            
-                prefix = os.path.commonprefix([abs_directory, abs_target])
-                
-                return prefix == abs_directory
-            
-            def safe_extract(tar, path=".", members=None, *, numeric_owner=False):
-            
-                for member in tar.getmembers():
-                    member_path = os.path.join(path, member.name)
-                    if not is_within_directory(path, member_path):
-                        raise Exception("Attempted Path Traversal in Tar File")
-            
-                tar.extractall(path, members, numeric_owner=numeric_owner) 
-                
-            
-            safe_extract(f, path=download_directory)
-
     data_dir = os.path.join(download_directory, "mnist-tfrecord")
-    assert tf.io.gfile.exists(data_dir)
+    sentinel = os.path.join(download_directory, MNIST_EXTRACTED_SENTINEL)
+
+    # Every worker of a distributed trial calls this with the same download_directory; the first one
+    # to take the lock does the work, and the others find the data ready once it is released.
+    # The sentinel is only checked, removed, and written while the lock is held, so a worker never
+    # sees a sentinel for data that another worker is still extracting.
+    with exclusive_lock(os.path.join(download_directory, MNIST_LOCK_FILE)):
+        extracted = False
+        if not os.path.exists(filepath):
+            # Whatever is extracted next replaces the data the sentinel describes.
+            remove_if_exists(sentinel)
+            if os.path.exists(filepath + ".part"):
+                # Resume the interrupted download; it is extracted from the file afterwards.
+                logging.info("Resuming download of {}".format(MNIST_TF_RECORDS_URL))
+                download_file(MNIST_TF_RECORDS_URL, filepath)
+            else:
+                logging.info(
+                    "Downloading {} and extracting it to {}".format(
+                        MNIST_TF_RECORDS_URL, download_directory
+                    )
+                )
+                download_and_extract(MNIST_TF_RECORDS_URL, filepath, download_directory)
+                extracted = True
+            logging.info(
+                "Downloaded {} ({} bytes)".format(MNIST_TF_RECORDS_FILE, os.path.getsize(filepath))
+            )
+
+        # Only trust the extracted data if a previous extraction of this exact archive completed;
+        # otherwise an interrupted extraction would leave a broken data_dir behind forever.
+        digest = sha256_file(filepath)
+        if not extracted:
+            if os.path.exists(sentinel) and os.path.exists(data_dir):
+                with open(sentinel) as f:
+                    if f.read().strip() == digest:
+                        return data_dir
+
+            logging.info("Extracting {} to {}".format(MNIST_TF_RECORDS_FILE, download_directory))
+            remove_if_exists(sentinel)
+            try:
+                with open(filepath, "rb") as f:
+                    extract(f, download_directory)
+            except Exception:
+                # The archive is bad, e.g. from a resume that went wrong.  Remove it, while the lock
+                # is still held, so that the next call downloads it again instead of failing on the
+                # same file forever.
+                os.remove(filepath)
+                raise
+        # Write the sentinel under another name first, so it is never seen half-written.
+        with open(sentinel + ".tmp", "w") as f:
+            f.write(digest)
+        os.replace(sentinel + ".tmp", sentinel)
+
+    assert os.path.exists(data_dir)
     return data_dir
@@ -1,8 +1,12 @@
+import http.cookiejar
+import threading
+import weakref
 from typing import Any, Dict, Optional
 
 import requests
 import urllib3
 
+import determined.common.requests
 from determined.common import util
 from determined.common.api import authentication, certs, request
 
@@ -22,6 +26,69 @@ class Session:
         self._cert = cert
         self._max_retries = max_retries
 
+        # Keep connections to the master alive between requests, so that repeated calls (like the
+        # preemption long-poll) do not pay for a new TCP and TLS handshake every time.  Each thread
+        # gets its own connection pool, so a background thread's long-poll holds a dedicated
+        # connection and never shares a requests.Session with the main thread.  Every Session
+        # created is also tracked in _http_sessions, so that close() can reach all of them.  The
+        # tracking is weak: once a thread exits, its Session (and its sockets) can be collected.
+        self._http = threading.local()
+        self._http_sessions: "weakref.WeakSet[requests.Session]" = weakref.WeakSet()
+        self._http_lock = threading.Lock()
+
+    def _get_http(self) -> requests.Session:
+        # Mirror the cert defaulting in request.do_request(), since the server_hostname is baked
+        # into the underlying Session's https adapter.
+        cert = self._cert or certs.cli_cert
+        server_hostname = cert.name if cert else None
+        sess = getattr(self._http, "session", None)  # type: Optional[requests.Session]
+        if sess is None or server_hostname != self._http.server_hostname:
+            # Only one master is ever contacted, and a thread rarely has more than one request in
+            # flight, so keep the pools small.
+            sess = determined.common.requests.Session(
+                server_hostname, self._max_retries, pool_connections=1, pool_maxsize=2
+            )
+            # Stay stateless between requests, as when every request had its own Session: never
+            # store cookies set by the master, so none are replayed.
+            sess.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+            self._http.session = sess
+            self._http.server_hostname = server_hostname
+            with self._http_lock:
+                self._http_sessions.add(sess)
+        return sess
+
+    def close(self) -> None:
+        """
+        Close any connections kept open to the master.  The Session remains usable afterwards;
+        new connections are opened as they are needed.
+        """
+        with self._http_lock:
+            sessions = list(self._http_sessions)
+            self._http_sessions = weakref.WeakSet()
+            self._http = threading.local()
+        for sess in sessions:
+            sess.close()
+
+    def __enter__(self) -> "Session":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Open connections cannot be pickled; the copy will open its own.
+        state = self.__dict__.copy()
+        del state["_http"]
+        del state["_http_sessions"]
+        del state["_http_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._http = threading.local()
+        self._http_sessions = weakref.WeakSet()
+        self._http_lock = threading.Lock()
+
     def _do_request(
         self,
         method: str,
@@ -46,6 +113,7 @@ class Session:
             timeout=timeout,
             stream=stream,
             max_retries=self._max_retries,
+            session=self._get_http(),
         )
 
     def get(
@@ -143,9 +143,9 @@ def do_login(
     cert: Optional[certs.Cert] = None,
 ) -> str:
     password = api.salt_and_hash(password)
-    unauth_session = api.Session(user=username, master=master_address, auth=None, cert=cert)
     login = bindings.v1LoginRequest(username=username, password=password, isHashed=True)
-    r = bindings.post_Login(session=unauth_session, body=login)
+    with api.Session(user=username, master=master_address, auth=None, cert=cert) as unauth_session:
+        r = bindings.post_Login(session=unauth_session, body=login)
     token = r.token
 
     return token
@@ -153,8 +153,8 @@ def create_experiment(
     experiment_id = int(new_resource.split("/")[-1])
 
     if activate:
-        sess = api.Session(master_url, None, None, None)
-        bindings.post_ActivateExperiment(sess, id=experiment_id)
+        with api.Session(master_url, None, None, None) as sess:
+            bindings.post_ActivateExperiment(sess, id=experiment_id)
 
     return experiment_id
 
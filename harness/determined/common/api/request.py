@@ -101,6 +101,7 @@ def do_request(
     stream: bool = False,
     timeout: Optional[Union[Tuple, float]] = None,
     max_retries: Optional[urllib3.util.retry.Retry] = None,
+    session: Optional[requests.Session] = None,
 ) -> requests.Response:
     # If no explicit Authentication object was provided, use the cli's singleton Authentication.
     if auth is None:
@@ -138,6 +139,7 @@ def do_request(
             timeout=timeout,
             server_hostname=cert.name if cert else None,
             max_retries=max_retries,
+            session=session,
         )
     except requests.exceptions.SSLError:
         raise
@@ -23,20 +23,36 @@ class HTTPAdapter(requests.adapters.HTTPAdapter):
 
 class Session(requests.sessions.Session):
     def __init__(
-        self, server_hostname: Optional[str], max_retries: Optional[urllib3.util.retry.Retry]
+        self,
+        server_hostname: Optional[str],
+        max_retries: Optional[urllib3.util.retry.Retry],
+        **adapter_kwargs: Any,
     ) -> None:
         super().__init__()
         if max_retries is None:
             # Override the https adapter.
-            self.mount("https://", HTTPAdapter(server_hostname))
+            self.mount("https://", HTTPAdapter(server_hostname, **adapter_kwargs))
+            if adapter_kwargs:
+                self.mount("http://", requests.adapters.HTTPAdapter(**adapter_kwargs))
         else:
-            self.mount("https://", HTTPAdapter(server_hostname, max_retries=max_retries))
-            self.mount("http://", requests.adapters.HTTPAdapter(max_retries=max_retries))
-
-
-def request(method: str, url: str, **kwargs: Any) -> requests.Response:
+            self.mount(
+                "https://",
+                HTTPAdapter(server_hostname, max_retries=max_retries, **adapter_kwargs),
+            )
+            self.mount(
+                "http://", requests.adapters.HTTPAdapter(max_retries=max_retries, **adapter_kwargs)
+            )
+
+
+def request(
+    method: str, url: str, session: Optional[requests.Session] = None, **kwargs: Any
+) -> requests.Response:
     server_hostname = kwargs.pop("server_hostname", None)
     max_retries = kwargs.pop("max_retries", None)
+    if session is not None:
+        # Reuse the caller's Session (and its open connections), which must already have been
+        # configured with the same server_hostname and max_retries.
+        return session.request(method=method, url=url, **kwargs)
     with Session(server_hostname, max_retries) as session:
         out = session.request(method=method, url=url, **kwargs)  # type: requests.Response
         return out
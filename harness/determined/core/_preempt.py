@@ -1,8 +1,7 @@
 import enum
 import logging
 import threading
-import time
-from typing import Any, Optional
+from typing import Any
 
 import requests
 
@@ -39,10 +38,11 @@ class _PreemptionWatcher(threading.Thread):
         self._session = session
         self._allocation_id = allocation_id
 
-        self._should_preempt = None  # type: Optional[bool]
-        self._should_quit = False
+        self._should_preempt = False
+        self._quit = threading.Event()
 
-        self._cond = threading.Condition()
+        # Set once the initial response from the master has been received.
+        self._ready = threading.Event()
 
         # Set daemon=True, since the requests library only supports blocking reads.  Under the hood,
         # the requests library uses buffered IO on top of the socket, which means that we can't even
@@ -64,27 +64,24 @@ class _PreemptionWatcher(threading.Thread):
 
     def run(self) -> None:
         # Do a rapid check for the initial value.
-        with self._cond:
-            try:
-                self._should_preempt = self._get_preemption(0)
-            except requests.Timeout:
-                logging.warning(
-                    "timeout during initial preemption API check (continuing):", exc_info=True
-                )
-                self._should_preempt = False
-            except Exception:
-                logging.warning(
-                    "failure during initial preemption API check (continuing):", exc_info=True
-                )
-                self._should_preempt = False
-            finally:
-                # Wake the main thread in case it was waiting for the initial response.
-                self._cond.notify()
+        try:
+            self._should_preempt = self._get_preemption(0)
+        except requests.Timeout:
+            logging.warning(
+                "timeout during initial preemption API check (continuing):", exc_info=True
+            )
+        except Exception:
+            logging.warning(
+                "failure during initial preemption API check (continuing):", exc_info=True
+            )
+        finally:
+            # Wake the main thread in case it was waiting for the initial response.
+            self._ready.set()
 
         # Continuously poll for preemption status to change.  Always retry after network failures;
         # if the master is unreachable, either user code will exit due to some more critical API
         # failure, or the user will kill the task.
-        while not self._should_preempt and not self._should_quit:
+        while not self._should_preempt and not self._quit.is_set():
             try:
                 self._should_preempt = self._get_preemption(60)
             except requests.Timeout:
@@ -95,12 +92,18 @@ class _PreemptionWatcher(threading.Thread):
                 logging.warning(
                     "failure communicating with preemption API (retrying in 10s):", exc_info=True
                 )
-                time.sleep(10)
+                # Wait on the quit Event rather than sleeping, so close() cuts the back-off short.
+                self._quit.wait(10)
 
     def close(self) -> None:
+        """
+        Ask the watcher thread to stop.  A retry back-off ends immediately, but a long-poll which is
+        already in flight cannot be interrupted (see the note on daemon=True), so the thread only
+        exits once that request returns.
+        """
         # TODO: For now we have to set daemon=True for the thread, so there's no point in joining.
         # self.join()
-        self._should_quit = True
+        self._quit.set()
 
     def __enter__(self) -> "_PreemptionWatcher":
         self.start()
@@ -110,14 +113,10 @@ class _PreemptionWatcher(threading.Thread):
         self.close()
 
     def should_preempt(self) -> bool:
-        # Optimize to avoid locking the threading.Conditional object if we can avoid it.
-        if self._should_preempt is not None:
-            return self._should_preempt
-
-        # Block until the Preemption API has streamed the initial response.
-        with self._cond:
-            while self._should_preempt is None:
-                self._cond.wait()
+        # Event.is_set() does not take a lock, unlike Event.wait(), so only wait when we must.
+        if not self._ready.is_set():
+            # Block until the Preemption API has streamed the initial response.
+            self._ready.wait()
         return self._should_preempt
 
 
@@ -128,7 +127,8 @@ class PreemptMode(enum.Enum):
     When mode is ``WorkersAskChief`` (the default), all workers must call ``should_preempt()``
     in step.  Only the chief actually communicates with the master, then the chief broadcasts its
     decision to all workers.  This guarantees that all workers decide to preempt at the exact same
-    time.
+    time.  The broadcast happens on every call, even when the decision has not changed, because
+    skipping it would let workers return a stale decision and lose that guarantee.
 
     When mode is ``ChiefOnly``, only the chief is allowed to call
     ``PreemptContext.should_preempt()``.  Usually this implies you must manually inform the workers
@@ -162,9 +162,13 @@ class PreemptContext:
         self._allocation_id = allocation_id
         self._dist = dist
         self._preempt_mode = PreemptMode(preempt_mode)
+        # should_preempt() may be called very frequently, so precompute what it needs to check.
+        self._is_chief = self._dist.get_rank() == 0
+        self._workers_ask_chief = self._preempt_mode is PreemptMode.WorkersAskChief
+        self._chief_only = self._preempt_mode is PreemptMode.ChiefOnly
         self._watcher = None
         self._started = False
-        if self._dist.get_rank() == 0 or self._preempt_mode == PreemptMode.WorkersAskMaster:
+        if self._is_chief or self._preempt_mode is PreemptMode.WorkersAskMaster:
             self._watcher = _PreemptionWatcher(session, allocation_id)
         self._ack_sent = False
 
@@ -224,11 +228,11 @@ class PreemptContext:
                 # Tell the master that user code has received the preemption signal.
                 self.acknowledge_preemption_signal()
                 self._ack_sent = True
-            if self._preempt_mode == PreemptMode.WorkersAskChief:
+            if self._workers_ask_chief:
                 _ = self._dist.broadcast(out)
         else:
             # No watcher; we should ask the chief or either we should not be here.
-            if self._preempt_mode == PreemptMode.ChiefOnly:
+            if self._chief_only:
                 raise RuntimeError(
                     "PreemptContext was configured with preempt_mode=ChiefOnly but "
                     ".should_preempt() was called from non-chief worker of "
@@ -269,6 +273,9 @@ class DummyPreemptContext(PreemptContext):
     ) -> None:
         self._dist = dist
         self._preempt_mode = PreemptMode(preempt_mode)
+        self._is_chief = self._dist.get_rank() == 0
+        self._workers_ask_chief = self._preempt_mode is PreemptMode.WorkersAskChief
+        self._chief_only = self._preempt_mode is PreemptMode.ChiefOnly
         self._started = False
 
     def start(self) -> "PreemptContext":
@@ -292,19 +299,19 @@ class DummyPreemptContext(PreemptContext):
             raise RuntimeError(
                 "you cannot call PreemptContext.should_preempt() before PreemptContext.start()"
             )
-        if self._dist.rank == 0:
-            if self._preempt_mode == PreemptMode.WorkersAskChief:
+        if self._is_chief:
+            if self._workers_ask_chief:
                 # Even though we always return False, preserve the synchronization behavior to avoid
                 # giving the user a weird inconsistency between managed and unmanaged dtrain code.
                 _ = self._dist.broadcast(False)
         else:
-            if self._preempt_mode == PreemptMode.ChiefOnly:
+            if self._chief_only:
                 raise RuntimeError(
                     "PreemptContext was configured with preempt_mode=ChiefOnly but "
                     ".should_preempt() was called from non-chief worker of "
                     f"rank={self._dist.get_rank()}"
                 )
-            if self._preempt_mode == PreemptMode.WorkersAskChief:
+            if self._workers_ask_chief:
                 _ = self._dist.broadcast(None)
         return False
 
@@ -26,10 +26,18 @@ class _SerialMessage:
     to confirm that our broadcasting does not get out-of-sync.
     """
 
+    __slots__ = ("serial", "payload")
+
     def __init__(self, serial: int, payload: Any) -> None:
         self.serial = serial
         self.payload = payload
 
+    def __reduce__(self) -> Tuple[type, Tuple[int, Any]]:
+        # Pickle as a plain constructor call.  This is smaller and faster to pickle and unpickle
+        # than the default __dict__-based state, which matters for the tiny messages (such as the
+        # should_preempt() decision) that make up most broadcasts.
+        return (_SerialMessage, (self.serial, self.payload))
+
 
 class ZMQBroadcastServer:
     """
@@ -0,0 +1,157 @@
+import gc
+import http.server
+import threading
+import time
+from typing import Any, List, Set
+
+import requests
+
+from determined.common import api
+
+
+def test_session_reuses_connections() -> None:
+    client_ports: Set[int] = set()
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:
+            client_ports.add(self.client_address[1])
+            body = b"{}"
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, args=[0.1])
+    thread.start()
+    try:
+        session = api.Session(f"http://127.0.0.1:{server.server_port}", None, None, None)
+        for _ in range(3):
+            assert session.get("/api/v1/master").json() == {}
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+    # Every request should have been sent over the same kept-alive connection.
+    assert len(client_ports) == 1, client_ports
+
+
+def test_session_connections_are_per_thread() -> None:
+    session = api.Session("http://127.0.0.1:8080", None, None, None)
+    main_http = session._get_http()
+    assert session._get_http() is main_http
+
+    thread_http: List[requests.Session] = []
+    thread = threading.Thread(target=lambda: thread_http.append(session._get_http()))
+    thread.start()
+    thread.join()
+    assert thread_http[0] is not main_http
+
+
+def test_session_does_not_keep_cookies() -> None:
+    cookie_headers: List[str] = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:
+            cookie_headers.append(self.headers.get("Cookie", ""))
+            body = b"{}"
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Set-Cookie", "session=abc; Path=/")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, args=[0.1])
+    thread.start()
+    try:
+        with api.Session(f"http://127.0.0.1:{server.server_port}", None, None, None) as session:
+            for _ in range(2):
+                session.get("/api/v1/master")
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+    assert cookie_headers == ["", ""], cookie_headers
+
+
+def test_session_close() -> None:
+    session = api.Session("http://127.0.0.1:8080", None, None, None)
+    main_http = session._get_http()
+    thread_http: List[requests.Session] = []
+    thread = threading.Thread(target=lambda: thread_http.append(session._get_http()))
+    thread.start()
+    thread.join()
+    assert len(session._http_sessions) == 2
+
+    session.close()
+    assert len(session._http_sessions) == 0
+    # The Session stays usable, with a fresh requests.Session.
+    assert session._get_http() is not main_http
+
+
+def test_session_releases_connections_of_finished_threads() -> None:
+    open_connections = 0
+    lock = threading.Lock()
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self) -> None:
+            nonlocal open_connections
+            with lock:
+                open_connections += 1
+            super().setup()
+
+        def finish(self) -> None:
+            nonlocal open_connections
+            super().finish()
+            with lock:
+                open_connections -= 1
+
+        def do_GET(self) -> None:
+            body = b"{}"
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server_thread = threading.Thread(target=server.serve_forever, args=[0.1])
+    server_thread.start()
+    try:
+        session = api.Session(f"http://127.0.0.1:{server.server_port}", None, None, None)
+        for _ in range(50):
+            thread = threading.Thread(target=session.get, args=["/api/v1/master"])
+            thread.start()
+            thread.join()
+
+        gc.collect()
+        assert len(session._http_sessions) == 0
+        # Collecting each finished thread's Session closes its connection to the master.
+        deadline = time.time() + 5
+        while open_connections and time.time() < deadline:
+            time.sleep(0.01)
+        assert open_connections == 0
+    finally:
+        server.shutdown()
+        server.server_close()
+        server_thread.join()
@@ -225,3 +225,22 @@ def test_check_started(dummy: bool) -> None:
                 context.should_preempt()
             with context:
                 assert context.should_preempt() is False
+
+
+def test_close_interrupts_retry_backoff() -> None:
+    session = mock.MagicMock()
+    session.get.side_effect = ConnectionError("master unreachable")
+
+    watcher = core._PreemptionWatcher(session, "allocation_id")
+    watcher.start()
+    # The initial check fails, then the long-poll fails and the watcher backs off for 10s.
+    assert watcher.should_preempt() is False
+    for i in range(10):
+        if session.get.call_count >= 2:
+            break
+        time.sleep((i / 10) ** 2)
+    assert session.get.call_count >= 2
+
+    watcher.close()
+    watcher.join(timeout=5)
+    assert not watcher.is_alive()